@@ -1,20 +1,46 @@
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import streamlit as st
+try:
+    import requests_cache
+except ImportError:  # optional: falls back to an uncached session
+    requests_cache = None
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # optional: LLM cache falls back to exact-match only
+    SentenceTransformer = None
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
+    from reportlab.lib import colors
+    _HAS_REPORTLAB = True
+except ImportError:  # optional: PDF export disabled
+    _HAS_REPORTLAB = False
 from dotenv import load_dotenv
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
 import base64
+import re
+from io import BytesIO
+import hashlib
+import pickle
+import threading
 
 # Load environment variables from .env (if present)
 load_dotenv()
 
-# Page config
-st.set_page_config(page_title="Wikipedia Research Agent", page_icon="📚", layout="wide", initial_sidebar_state="expanded")
-
-# Custom CSS
-st.markdown("""
+# Static page markup, shared by every rerun
+_CSS = """
 <style>
     .stButton > button {
         border-radius: 8px;
@@ -43,7 +69,117 @@ st.markdown("""
         color: white;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_FOOTER_HTML = """
+<div style='text-align: center'>
+    <p><small>📚 Wikipedia Research Agent v2.0</small></p>
+    <p><small>Made with ❤️ for Research Excellence by <strong>Manideep Reddy Eevuri</strong></small></p>
+    <p style='margin-top: 20px;'>
+        <a href='https://github.com/Maniredii' target='_blank' style='text-decoration: none; margin: 0 10px;'>
+            <img src='https://img.shields.io/badge/GitHub-100000?style=for-the-badge&logo=github&logoColor=white' alt='GitHub'>
+        </a>
+        <a href='https://www.linkedin.com/in/manideep-reddy-eevuri-661659268/' target='_blank' style='text-decoration: none; margin: 0 10px;'>
+            <img src='https://img.shields.io/badge/LinkedIn-0077B5?style=for-the-badge&logo=linkedin&logoColor=white' alt='LinkedIn'>
+        </a>
+        <a href='https://buymeacoffee.com/manideep' target='_blank' style='text-decoration: none; margin: 0 10px;'>
+            <img src='https://img.shields.io/badge/Buy_Me_A_Coffee-FFDD00?style=for-the-badge&logo=buy-me-a-coffee&logoColor=black' alt='Buy Me A Coffee'>
+        </a>
+    </p>
+</div>
+"""
+
+# Page config
+st.set_page_config(page_title="Wikipedia Research Agent", page_icon="📚", layout="wide", initial_sidebar_state="expanded")
+
+
+# Retries the session adapter makes after the first attempt (also retries read timeouts on GET)
+_HTTP_RETRIES = 2
+
+
+@st.cache_resource
+def _get_session() -> requests.Session:
+    """Shared HTTP session so Wikipedia/OpenRouter calls reuse pooled keep-alive connections.
+
+    With requests-cache installed, GET responses are also persisted to sqlite for a day.
+    """
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            "wiki_cache", backend="sqlite", expire_after=86400, allowable_methods=("GET",)
+        )
+    else:
+        session = requests.Session()
+    session.headers.update({"User-Agent": "WikipediaResearchAgent/2.0"})
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(total=_HTTP_RETRIES, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _get_session()
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON, preferring orjson when available."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps_indent(obj: Any) -> str:
+    """Pretty-print JSON with 2-space indents, preferring orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+_WIKI_API = "https://en.wikipedia.org/w/api.php"
+# Markdown/emoji markers dropped from plain-text exports
+_STRIP_RE = re.compile(r"\*\*|🔗|📖|###")
+# Max titles per MediaWiki extracts request (exlimit cap in intro mode)
+_EXTRACT_BATCH_SIZE = 20
+# Snippet length per source, truncated server-side via exchars; TextExtracts caps exchars
+# at 1200, so larger values are clamped below rather than silently ignored by the API
+_SNIPPET_CHARS = 1200
+_MAX_EXCHARS = 1200
+# Extracts shorter than this are treated as stubs and dropped
+_MIN_EXTRACT_CHARS = 100
+
+
+def _norm_title(title: str) -> str:
+    """Canonical form for spotting near-duplicate titles.
+
+    Parentheses are flattened rather than dropped so "Python (programming language)" matches
+    "Python programming language" while "Python (genus)" stays distinct.
+    """
+    return " ".join(re.sub(r"[()_,]", " ", title).split()).lower()
+
+
+@st.cache_data(ttl=86400, max_entries=512, show_spinner=False)
+def _fetch_extracts(batch: Tuple[str, ...], _timeout: float = 15) -> Dict[str, Any]:
+    """Get intro extracts for a whole batch of titles in one request.
+
+    _timeout is left out of the cache key (leading underscore) so deadline-capped calls still share entries.
+    """
+    content_params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": "2",
+        "titles": "|".join(batch),
+        "prop": "extracts",
+        "explaintext": True,
+        "exintro": True,
+        "exlimit": "max",
+        "exchars": min(_SNIPPET_CHARS, _MAX_EXCHARS),
+        "redirects": 1
+    }
+    resp = _SESSION.get(_WIKI_API, params=content_params, timeout=_timeout)
+    resp.raise_for_status()
+    return _loads(resp.content)
+
+
+# Custom CSS
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # Initialize session state
 if "openrouter_api_key" not in st.session_state:
@@ -52,6 +188,10 @@ if "groq_api_key" not in st.session_state:
     st.session_state.groq_api_key = os.environ.get("GROQ_API_KEY", "")
 if "research_results" not in st.session_state:
     st.session_state.research_results = None
+if "research_summary_lower" not in st.session_state:
+    st.session_state.research_summary_lower = ""
+if "ai_summary" not in st.session_state:
+    st.session_state.ai_summary = None
 
 # Sidebar - API keys
 with st.sidebar:
@@ -83,7 +223,7 @@ with st.sidebar:
             if st.session_state.openrouter_api_key:
                 try:
                     payload = {"model": "tngtech/deepseek-r1t2-chimera:free", "messages": [{"role": "user", "content": "Ping"}]}
-                    r = requests.post(
+                    r = _SESSION.post(
                         "https://openrouter.ai/api/v1/chat/completions",
                         headers={"Authorization": f"Bearer {st.session_state.openrouter_api_key}", "Content-Type": "application/json"},
                         json=payload,
@@ -98,6 +238,14 @@ with st.sidebar:
             else:
                 st.info("ℹ️ OpenRouter key not set")
 
+    with st.expander("🗄️ Cache"):
+        st.caption("Wikipedia responses are cached for 24 hours.")
+        if st.button("🧹 Force refresh"):
+            st.cache_data.clear()
+            if hasattr(_SESSION, "cache"):
+                _SESSION.cache.clear()
+            st.success("✅ Cache cleared")
+
 # Main UI
 col1, col2 = st.columns([3, 1])
 with col1:
@@ -125,10 +273,11 @@ with col4:
     max_depth = st.slider("Depth", min_value=1, max_value=3, value=2, label_visibility="collapsed", help="Search depth level (1=quick, 3=thorough)")
 
 
-def generate_summary(research_data: Dict[str, Any], query: str) -> str:
-    """Generate AI summary of research findings."""
+def generate_summary(research_data: Dict[str, Any], query: str, use_cache: bool = True) -> Iterator[str]:
+    """Stream an AI summary of research findings."""
     if not (st.session_state.openrouter_api_key or st.session_state.groq_api_key):
-        return "AI summary unavailable - set API key in configuration"
+        yield "AI summary unavailable - set API key in configuration"
+        return
     
     try:
         sources_text = "\n".join([f"- {s['title']}: {s['snippet'][:200]}" for s in research_data.get("sources", [])[:5]])
@@ -136,9 +285,9 @@ def generate_summary(research_data: Dict[str, Any], query: str) -> str:
             {"role": "system", "content": "You are a research expert. Provide a concise, well-structured summary of the research findings in 2-3 paragraphs."},
             {"role": "user", "content": f"Topic: {query}\n\nSources:\n{sources_text}\n\nPlease summarize the key findings."}
         ]
-        return call_llm(messages, temperature=0.7)
+        yield from call_llm(messages, temperature=0.7, use_cache=use_cache)
     except Exception as e:
-        return f"Summary generation failed: {str(e)}"
+        yield f"Summary generation failed: {str(e)}"
 
 
 def download_report(content: str, format_type: str, filename: str):
@@ -146,7 +295,7 @@ def download_report(content: str, format_type: str, filename: str):
     if format_type == "markdown":
         return content
     elif format_type == "text":
-        return content.replace("**", "").replace("🔗", "").replace("📖", "")
+        return _STRIP_RE.sub("", content)
     elif format_type == "html":
         return f"<html><body><pre>{content}</pre></body></html>"
     return content
@@ -157,47 +306,65 @@ def copy_to_clipboard(text: str):
     return text
 
 
-def generate_pdf_report(topic: str, results: Dict[str, Any]) -> bytes:
-    """Generate a PDF report from research results."""
-    try:
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-        from reportlab.lib import colors
-        from io import BytesIO
-        
-        # Create PDF in memory
-        pdf_buffer = BytesIO()
-        doc = SimpleDocTemplate(pdf_buffer, pagesize=letter,
-                               rightMargin=0.5*inch, leftMargin=0.5*inch,
-                               topMargin=0.75*inch, bottomMargin=0.75*inch)
-        
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
+@st.cache_resource
+def _get_pdf_styles() -> Dict[str, Any]:
+    """Build the report's paragraph and table styles once per process."""
+    styles = getSampleStyleSheet()
+    return {
+        "sample": styles,
+        "title": ParagraphStyle(
             'CustomTitle',
             parent=styles['Heading1'],
             fontSize=24,
             textColor=colors.HexColor('#667eea'),
             spaceAfter=12,
             fontName='Helvetica-Bold'
-        )
-        
-        heading_style = ParagraphStyle(
+        ),
+        "heading": ParagraphStyle(
             'CustomHeading',
             parent=styles['Heading2'],
             fontSize=14,
             textColor=colors.HexColor('#764ba2'),
             spaceAfter=10,
             fontName='Helvetica-Bold'
-        )
+        ),
+        "table": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ]),
+    }
+
+
+def generate_pdf_report(topic: str, results: Dict[str, Any], generated: Optional[str] = None) -> bytes:
+    """Generate a PDF report from research results, stamped with `generated` (defaults to now)."""
+    if not _HAS_REPORTLAB:
+        st.error("❌ reportlab not installed. Install with: pip install reportlab")
+        return None
+    
+    try:
+        # Create PDF in memory
+        pdf_buffer = BytesIO()
+        doc = SimpleDocTemplate(pdf_buffer, pagesize=letter,
+                               rightMargin=0.5*inch, leftMargin=0.5*inch,
+                               topMargin=0.75*inch, bottomMargin=0.75*inch)
+        
+        story = []
+        pdf_styles = _get_pdf_styles()
+        styles = pdf_styles["sample"]
+        title_style = pdf_styles["title"]
+        heading_style = pdf_styles["heading"]
         
         # Title
         story.append(Paragraph(f"Research Report: {topic}", title_style))
-        story.append(Paragraph(f"<i>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</i>", styles['Normal']))
+        generated = generated or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        story.append(Paragraph(f"<i>Generated: {generated}</i>", styles['Normal']))
         story.append(Spacer(1, 0.3*inch))
         
         # Summary section
@@ -222,17 +389,7 @@ def generate_pdf_report(topic: str, results: Dict[str, Any]) -> bytes:
             
             # Create and style table
             table = Table(table_data, colWidths=[0.5*inch, 2.5*inch, 2.5*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ]))
+            table.setStyle(pdf_styles["table"])
             story.append(table)
         
         story.append(Spacer(1, 0.2*inch))
@@ -254,139 +411,505 @@ def generate_pdf_report(topic: str, results: Dict[str, Any]) -> bytes:
         pdf_buffer.seek(0)
         return pdf_buffer.getvalue()
     
-    except ImportError:
-        st.error("❌ reportlab not installed. Install with: pip install reportlab")
-        return None
     except Exception as e:
         st.error(f"❌ PDF generation failed: {str(e)}")
         return None
 
 
-def call_llm(messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
-    """Call OpenRouter first, fall back to Groq if available."""
-    # OpenRouter HTTP
+def _results_digest(results: Dict[str, Any]) -> str:
+    """Stable key for a results dict, used to memoize export payloads."""
+    return hashlib.md5(json.dumps(results, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# The leading underscore on _results tells st.cache_data not to hash it; results_key stands in for it.
+# The "generated" stamp is set once when a result is stored, so it is covered by results_key.
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _build_markdown(results_key: str, topic: str, _results: Dict[str, Any]) -> str:
+    report_parts = [f"""# Research Report: {topic}
+
+**Generated:** {_results.get('generated', 'N/A')}
+
+## Overview
+{_results.get('summary', 'No summary available')[:1000]}
+
+## Sources ({len(_results.get('sources', []))})
+"""]
+    
+    for i, source in enumerate(_results.get("sources", []), 1):
+        report_parts.append(f"\n### {i}. {source['title']}\n")
+        report_parts.append(f"**URL:** {source.get('url', 'N/A')}\n\n")
+        report_parts.append(f"{source.get('snippet', 'No content')}\n\n")
+    return "".join(report_parts)
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _build_text(results_key: str, topic: str, _results: Dict[str, Any]) -> str:
+    return download_report(_build_markdown(results_key, topic, _results), "text", topic)
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _build_json(results_key: str, _results: Dict[str, Any]) -> str:
+    return _dumps_indent(_results)
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _build_pdf(results_key: str, topic: str, _results: Dict[str, Any]) -> bytes:
+    return generate_pdf_report(topic, _results, _results.get("generated"))
+
+
+class LLMCache:
+    """Cache LLM completions by exact prompt hash, with embedding similarity for near-duplicates.
+
+    Holds at most `max_entries` completions; the oldest are evicted first.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.92, max_entries: int = 500):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._exact: Dict[str, str] = {}
+        self._vecs: List[Tuple[Any, str]] = []
+        self._matrix = None
+        self._model = None
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def key(messages: List[Dict[str, str]]) -> str:
+        return hashlib.sha256(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+
+    def _load(self):
+        # Any unreadable or unexpected payload (corrupt file, missing numpy, mismatched vectors)
+        # just means starting with an empty cache
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+            exact = dict(data.get("exact", {}))
+            vecs = list(data.get("vecs", []))
+            matrix = np.stack([vec for vec, _ in vecs]) if vecs and SentenceTransformer is not None else None
+        except Exception:
+            return
+        self._exact = exact
+        # Vectors are kept (and re-saved) even when sentence-transformers is absent, so the
+        # persisted semantic index survives; they are only searched when a model is available
+        self._vecs = vecs
+        self._matrix = matrix
+
+    def _save(self):
+        # Write to a temp file and swap it in, so a crash mid-write never leaves a truncated cache
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"exact": self._exact, "vecs": self._vecs}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def _embed(self, messages: List[Dict[str, str]]):
+        if SentenceTransformer is None:
+            return None
+        # The model is loaded under its own lock so exact-match lookups never wait on the download
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+        return self._model.encode(messages[-1]["content"], normalize_embeddings=True)
+
+    def get(self, messages: List[Dict[str, str]]) -> Tuple[Optional[str], Any]:
+        """Return (cached completion or None, prompt embedding); pass the embedding on to put()."""
+        with self._lock:
+            hit = self._exact.get(self.key(messages))
+        if hit is not None:
+            return hit, None
+        emb = self._embed(messages)
+        if emb is None:
+            return None, None
+        with self._lock:
+            if self._matrix is None:
+                return None, emb
+            # Embeddings are normalized, so one matrix-vector product gives cosine similarities
+            sims = self._matrix @ emb
+            best = int(np.argmax(sims))
+            if sims[best] > self.threshold:
+                return self._vecs[best][1], emb
+        return None, emb
+
+    def put(self, messages: List[Dict[str, str]], content: str, emb: Any = None):
+        if not content:
+            return
+        with self._lock:
+            self._exact[self.key(messages)] = content
+            while len(self._exact) > self.max_entries:
+                del self._exact[next(iter(self._exact))]
+            if emb is not None:
+                self._vecs.append((emb, content))
+                self._matrix = emb[None, :] if self._matrix is None else np.vstack([self._matrix, emb])
+                if len(self._vecs) > self.max_entries:
+                    self._vecs = self._vecs[-self.max_entries:]
+                    self._matrix = self._matrix[-self.max_entries:]
+            self._save()
+
+
+@st.cache_resource
+def _get_llm_cache() -> LLMCache:
+    return LLMCache("llm_cache.pkl")
+
+
+@st.cache_resource(max_entries=4)
+def _get_groq_client(api_key: str):
+    """One Groq client per key, so its HTTP connection pool is reused across calls."""
+    import groq  # type: ignore
+    return groq.Groq(api_key=api_key)
+
+
+def call_llm(messages: List[Dict[str, str]], temperature: float = 0.7, use_cache: bool = True) -> Iterator[str]:
+    """Stream a completion from OpenRouter first, fall back to Groq if available.
+
+    Completions are served from the LLM cache when the same (or a near-identical) prompt was seen before,
+    and stored there once fully streamed. use_cache=False skips the lookup but still stores the result.
+    """
+    cache = _get_llm_cache()
+    cached, emb = cache.get(messages) if use_cache else (None, None)
+    if cached is not None:
+        yield cached
+        return
+
+    # OpenRouter HTTP (server-sent events)
     if st.session_state.openrouter_api_key:
+        parts = []
         try:
-            payload = {"model": "tngtech/deepseek-r1t2-chimera:free", "messages": messages, "temperature": temperature}
-            resp = requests.post(
+            payload = {"model": "tngtech/deepseek-r1t2-chimera:free", "messages": messages, "temperature": temperature, "stream": True}
+            resp = _SESSION.post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers={"Authorization": f"Bearer {st.session_state.openrouter_api_key}", "Content-Type": "application/json"},
                 json=payload,
                 timeout=60,
+                stream=True,
             )
-            resp.raise_for_status()
-            data = resp.json()
-            # OpenRouter uses OpenAI-like response structure
-            return data["choices"][0]["message"]["content"]
+            # Enter the context first so an error status still closes the response and frees the pooled connection
+            with resp:
+                resp.raise_for_status()
+                for line in resp.iter_lines():
+                    # Skip blank lines and ": OPENROUTER PROCESSING" keep-alive comments
+                    if not line.startswith(b"data: "):
+                        continue
+                    if line[6:] == b"[DONE]":
+                        break
+                    chunk = _loads(line[6:])
+                    if "error" in chunk:
+                        raise RuntimeError(chunk["error"].get("message", chunk["error"]))
+                    # OpenRouter uses OpenAI-like streaming deltas
+                    choices = chunk.get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content") or ""
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            cache.put(messages, "".join(parts), emb)
+            return
         except Exception as e:
+            if parts:
+                raise RuntimeError(f"OpenRouter stream interrupted: {e}")
             st.warning(f"OpenRouter call failed: {e}")
 
     # Groq fallback (best-effort)
     if st.session_state.groq_api_key:
+        parts = []
         try:
-            import groq  # type: ignore
-            client = groq.Groq(api_key=st.session_state.groq_api_key)
-            resp = client.chat.completions.create(model="mixtral-8x7b-32768", messages=messages, temperature=temperature)
-            # adapt to expected structure
-            return getattr(resp.choices[0].message, "content", str(resp))
+            client = _get_groq_client(st.session_state.groq_api_key)
+            stream = client.chat.completions.create(model="mixtral-8x7b-32768", messages=messages, temperature=temperature, stream=True)
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            cache.put(messages, "".join(parts), emb)
+            return
         except Exception as e:
             raise RuntimeError(f"Groq call failed: {e}")
 
     raise RuntimeError("No LLM provider available. Set OpenRouter or Groq key in the sidebar.")
 
 
-def deep_research(query: str, max_depth: int, time_limit: int, max_urls: int) -> Dict[str, Any]:
-    """Run web research using Wikipedia API."""
+@st.cache_data(ttl=3600, show_spinner=False)
+def _search_titles(query: str, max_urls: int) -> List[str]:
+    """Search Wikipedia and return distinct article titles in rank order.
+
+    Up to twice max_urls candidates come back; the extras backfill sources dropped as stubs.
+    """
+    search_params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": "2",
+        "list": "search",
+        "srsearch": query,
+        # Over-fetch so dropping near-duplicates and stubs still leaves max_urls sources
+        "srlimit": min(max_urls * 2, 50)
+    }
+    
+    search_resp = _SESSION.get(_WIKI_API, params=search_params, timeout=10)
+    search_data = _loads(search_resp.content)
+    
+    if "query" not in search_data or "search" not in search_data["query"]:
+        raise RuntimeError("No search results found")
+    
+    search_results = search_data["query"]["search"]
+    if not search_results:
+        raise RuntimeError(f"No results found for '{query}'")
+    
+    titles = []
+    seen = set()
+    for result in search_results:
+        title = result.get("title", "")
+        key = _norm_title(title)
+        if key in seen:
+            continue
+        seen.add(key)
+        titles.append(title)
+    return titles
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _do_research(query: str, max_urls: int, time_limit: int) -> Dict[str, Any]:
+    """Search Wikipedia and collect extracts; raises RuntimeError when nothing usable comes back.
+
+    No Streamlit output happens here so results can be memoized; non-fatal problems are
+    returned under "warnings" for the caller to display.
+    """
     import time
-    import json
     
     start_time = time.time()
-    results = {"query": query, "sources": []}
+    results = {"query": query, "sources": [], "warnings": []}
     content_summary = []
     
+    candidates = _search_titles(query, max_urls)
+    index = {title: idx for idx, title in enumerate(candidates)}
+    pages: Dict[int, Dict[str, Any]] = {}
+    timed_out = False
+    next_idx = 0
+    # The first request asks for max_urls titles (the slider caps it at 20, the MediaWiki intro-mode
+    # exlimit); later requests only backfill stubs dropped from it with spare candidates.
+    # The session retries timed-out GETs, so what is left of time_limit is split across all attempts.
+    # requests applies the timeout to the connect and to each socket read, so this keeps each call
+    # near the deadline, not strictly under it.
+    while len(pages) < max_urls and next_idx < len(candidates):
+        need = min(max_urls - len(pages), _EXTRACT_BATCH_SIZE)
+        batch = tuple(candidates[next_idx:next_idx + need])
+        next_idx += len(batch)
+        remaining = time_limit - (time.time() - start_time)
+        if remaining <= 0:
+            timed_out = True
+            break
+        try:
+            content_data = _fetch_extracts(batch, min(15, remaining / (1 + _HTTP_RETRIES)))
+        except requests.Timeout:
+            timed_out = True
+            break
+        except Exception as e:
+            results["warnings"].append(f"Could not fetch {len(batch)} articles: {str(e)[:40]}")
+            break
+        
+        if "query" in content_data and "pages" in content_data["query"]:
+            # Map normalized/redirected titles back to the searched ones
+            aliases = {}
+            for entry in content_data["query"].get("normalized", []) + content_data["query"].get("redirects", []):
+                aliases[entry["to"]] = aliases.get(entry["from"], entry["from"])
+            for page in content_data["query"]["pages"]:
+                title = aliases.get(page.get("title", ""), page.get("title", ""))
+                # Skip stubs and disambiguation pages that carry no real content
+                if len(page.get("extract", "")) >= _MIN_EXTRACT_CHARS and title in index:
+                    pages[index[title]] = page
+    if timed_out:
+        results["warnings"].append(f"Time limit reached, using {len(pages)} of {max_urls} articles")
+    
+    # Assemble in original search order
+    counter = 1
+    for idx in sorted(pages):
+        title = candidates[idx]
+        text = pages[idx]["extract"]
+        url = f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
+        
+        results["sources"].append({
+            "title": title,
+            "url": url,
+            "snippet": text
+        })
+        
+        # Format for display
+        content_summary.append(
+            f"{counter}. **{title}**\n\n"
+            f"{text}\n\n"
+            f"🔗 Source: {url}\n\n"
+            f"{'─' * 80}\n\n"
+        )
+        counter += 1
+    
+    if not content_summary:
+        if timed_out:
+            raise RuntimeError(f"Time limit of {time_limit}s reached before any content was retrieved")
+        raise RuntimeError("Could not retrieve any content")
+    
+    results["summary"] = "".join(content_summary)
+    return results
+
+
+def deep_research(query: str, max_depth: int, time_limit: int, max_urls: int) -> Dict[str, Any]:
+    """Run web research using Wikipedia API."""
+    # One status line and one progress bar, updated per stage instead of writing a new element per step
+    progress = st.progress(0.0)
+    status = st.empty()
     try:
         with st.spinner(f"Researching '{query}'..."):
-            headers = {"User-Agent": "Mozilla/5.0"}
-            
-            # Search Wikipedia for the query
-            search_url = "https://en.wikipedia.org/w/api.php"
-            search_params = {
-                "action": "query",
-                "format": "json",
-                "list": "search",
-                "srsearch": query,
-                "srlimit": max_urls
-            }
-            
-            st.write(f"🔍 Searching for '{query}'...")
-            search_resp = requests.get(search_url, params=search_params, headers=headers, timeout=10)
-            search_data = search_resp.json()
-            
-            if "query" in search_data and "search" in search_data["query"]:
-                search_results = search_data["query"]["search"]
-                
-                if not search_results:
-                    return {"success": False, "error": f"No results found for '{query}'"}
-                
-                # Fetch full content for each result
-                counter = 1
-                for result in search_results[:max_urls]:
-                    if time.time() - start_time > time_limit:
-                        break
-                    
-                    title = result.get("title", "")
-                    
-                    # Get full page content
-                    content_params = {
-                        "action": "query",
-                        "format": "json",
-                        "titles": title,
-                        "prop": "extracts",
-                        "explaintext": True,
-                        "exintro": False,
-                        "exlimit": 1
-                    }
-                    
-                    try:
-                        st.write(f"📖 Fetching [{counter}] {title}...")
-                        content_resp = requests.get(search_url, params=content_params, headers=headers, timeout=10)
-                        content_data = content_resp.json()
-                        
-                        if "query" in content_data and "pages" in content_data["query"]:
-                            for page_id, page in content_data["query"]["pages"].items():
-                                if "extract" in page:
-                                    text = page["extract"][:1200]
-                                    url = f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
-                                    
-                                    results["sources"].append({
-                                        "title": title,
-                                        "url": url,
-                                        "snippet": text
-                                    })
-                                    
-                                    # Format for display
-                                    content_summary.append(
-                                        f"{counter}. **{title}**\n\n"
-                                        f"{text}\n\n"
-                                        f"🔗 Source: {url}\n\n"
-                                        f"{'─' * 80}\n\n"
-                                    )
-                                    counter += 1
-                                    break
-                    except Exception as e:
-                        st.write(f"⚠️ Could not fetch {title}: {str(e)[:40]}")
-                        continue
-            else:
-                return {"success": False, "error": "No search results found"}
-            
-            results["summary"] = "".join(content_summary)
-            
-            if not content_summary:
-                return {"success": False, "error": "Could not retrieve any content"}
+            status.text(f"🔍 Searching for '{query}'...")
+            candidates = _search_titles(query, max_urls)
+            progress.progress(0.5)
+            status.text(f"📖 Fetching {min(len(candidates), max_urls)} articles...")
+            results = _do_research(query, max_urls, time_limit)
+            progress.progress(1.0)
         
+        for warning in results.pop("warnings", []):
+            st.write(f"⚠️ {warning}")
         return {"success": True, "data": results}
+    except RuntimeError as e:
+        return {"success": False, "error": str(e)}
     except Exception as e:
         return {"success": False, "error": f"Research failed: {str(e)}"}
+    finally:
+        status.empty()
+        progress.empty()
+
+
+@st.fragment
+def _sources_tab(results: Dict[str, Any]):
+    """Render the Sources tab."""
+    st.subheader("Research Sources")
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        sort_by = st.selectbox("Sort by", ["Order", "Title"])
+    
+    sources = results.get("sources", [])
+    if sources:
+        for i, source in enumerate(sources, 1):
+            with st.expander(f"**{i}. {source['title']}**", expanded=(i==1)):
+                st.markdown(f"**Source:** {source.get('url', 'N/A')}")
+                st.markdown(f"**Content:**\n\n{source.get('snippet', 'No content')}")
+    
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.button(f"📋 Copy", key=f"copy_{i}")
+                with col2:
+                    st.button(f"🔗 Visit", key=f"visit_{i}")
+                with col3:
+                    st.button(f"⭐ Save", key=f"save_{i}")
+    else:
+        st.info("No sources found")
+
+
+@st.fragment
+def _analysis_tab(results: Dict[str, Any]):
+    """Render the Analysis tab; the filter widgets rerun only this fragment."""
+    st.subheader("Research Analysis")
+    full_summary = results.get("summary", "No summary available")
+    st.markdown(full_summary)
+    
+    # Filtering options
+    col1, col2 = st.columns(2)
+    with col1:
+        filter_text = st.text_input("🔎 Filter content", placeholder="Search within results")
+    
+    with col2:
+        st.write("")
+        use_regex = st.checkbox("Regex", help="Treat the filter as a case-insensitive regular expression")
+    
+    if filter_text:
+        try:
+            if use_regex:
+                filtered = re.search(filter_text, full_summary, re.IGNORECASE) is not None
+            else:
+                filtered = filter_text.lower() in st.session_state.research_summary_lower
+        except re.error as e:
+            st.error(f"❌ Invalid regex: {e}")
+        else:
+            if filtered:
+                st.success(f"✅ Found: {filter_text}")
+            else:
+                st.warning(f"❌ Not found: {filter_text}")
+
+
+def _regenerate_summary():
+    st.session_state.ai_summary = None
+    st.session_state.ai_summary_refresh = True
+
+
+@st.fragment
+def _summary_tab(results: Dict[str, Any], topic: str):
+    """Render the AI summary tab."""
+    st.subheader("AI-Enhanced Summary")
+    # Generated once per result and kept in session state (failures included), so unrelated
+    # reruns never call the LLM again; only Regenerate Summary streams a fresh one
+    if st.session_state.ai_summary is None:
+        refresh = st.session_state.pop("ai_summary_refresh", False)
+        st.session_state.ai_summary = st.write_stream(generate_summary(results, topic, use_cache=not refresh))
+    else:
+        st.markdown(st.session_state.ai_summary)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("🔄 Regenerate Summary", on_click=_regenerate_summary)
+    with col2:
+        st.button("👎 Not helpful?")
+
+
+@st.fragment
+def _export_tab(results: Dict[str, Any], topic: str, time_limit: int):
+    """Render the Export tab."""
+    st.subheader("Export Report")
+    
+    # Export payloads are cached per results digest, so reruns skip rebuilding them
+    results_key = _results_digest(results)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.download_button(
+            label="📥 Markdown",
+            data=_build_markdown(results_key, topic, results),
+            file_name=f"{topic.replace(' ', '_')}_report.md",
+            mime="text/markdown",
+            use_container_width=True
+        )
+    with col2:
+        st.download_button(
+            label="📥 Text",
+            data=_build_text(results_key, topic, results),
+            file_name=f"{topic.replace(' ', '_')}_report.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+    with col3:
+        st.download_button(
+            label="📊 JSON",
+            data=_build_json(results_key, results),
+            file_name=f"{topic.replace(' ', '_')}_report.json",
+            mime="application/json",
+            use_container_width=True
+        )
+    with col4:
+        pdf_data = _build_pdf(results_key, topic, results)
+        if pdf_data:
+            st.download_button(
+                label="📄 PDF",
+                data=pdf_data,
+                file_name=f"{topic.replace(' ', '_')}_report.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+    
+    # Show statistics
+    st.markdown("---")
+    st.subheader("📈 Report Statistics")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("📊 Total Sources", len(results.get("sources", [])))
+    col2.metric("📝 Total Characters", len(results.get("summary", "")))
+    col3.metric("⏱️ Generation Time", f"{time_limit}s")
 
 
 # Main Research Button
@@ -398,8 +921,20 @@ with col2:
 with col3:
     st.write("")  # Spacer
 
+def _set_research_results(data: Optional[Dict[str, Any]]):
+    """Store a research result along with the per-result state derived from it."""
+    if data:
+        # Stamped once per result so cached export payloads keep a stable key
+        data["generated"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    st.session_state.research_results = data
+    # Lowercased once here so the Analysis filter only does the substring check per keystroke
+    st.session_state.research_summary_lower = data.get("summary", "").lower() if data else ""
+    # A new result needs a new AI summary
+    st.session_state.ai_summary = None
+
+
 if clear_button:
-    st.session_state.research_results = None
+    _set_research_results(None)
     st.rerun()
 
 if search_button:
@@ -410,147 +945,31 @@ if search_button:
         dr = deep_research(topic, max_depth, time_limit, max_urls)
         
         if not dr.get("success"):
+            _set_research_results(None)
             st.error(f"❌ Research failed: {dr.get('error')}")
         else:
-            st.session_state.research_results = dr.get("data")
-            results = st.session_state.research_results
-            
-            # Create tabs for different views
-            tab1, tab2, tab3, tab4 = st.tabs(["📚 Sources", "📊 Analysis", "💡 Summary", "⚙️ Export"])
-            
-            with tab1:
-                st.subheader("Research Sources")
-                col1, col2 = st.columns([3, 1])
-                with col2:
-                    sort_by = st.selectbox("Sort by", ["Order", "Title"])
-                
-                sources = results.get("sources", [])
-                if sources:
-                    for i, source in enumerate(sources, 1):
-                        with st.expander(f"**{i}. {source['title']}**", expanded=(i==1)):
-                            st.markdown(f"**Source:** {source.get('url', 'N/A')}")
-                            st.markdown(f"**Content:**\n\n{source.get('snippet', 'No content')}")
-                            
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.button(f"📋 Copy", key=f"copy_{i}")
-                            with col2:
-                                st.button(f"🔗 Visit", key=f"visit_{i}")
-                            with col3:
-                                st.button(f"⭐ Save", key=f"save_{i}")
-                else:
-                    st.info("No sources found")
-            
-            with tab2:
-                st.subheader("Research Analysis")
-                full_summary = results.get("summary", "No summary available")
-                st.markdown(full_summary)
-                
-                # Filtering options
-                col1, col2 = st.columns(2)
-                with col1:
-                    filter_text = st.text_input("🔎 Filter content", placeholder="Search within results")
-                    if filter_text:
-                        filtered = full_summary.lower().find(filter_text.lower()) != -1
-                        if filtered:
-                            st.success(f"✅ Found: {filter_text}")
-                        else:
-                            st.warning(f"❌ Not found: {filter_text}")
-                
-                with col2:
-                    st.write("")
-            
-            with tab3:
-                st.subheader("AI-Enhanced Summary")
-                with st.spinner("🤖 Generating summary..."):
-                    summary = generate_summary(results, topic)
-                    st.markdown(summary)
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.button("🔄 Regenerate Summary")
-                with col2:
-                    st.button("👎 Not helpful?")
-            
-            with tab4:
-                st.subheader("Export Report")
-                
-                # Generate report content
-                report_content = f"""# Research Report: {topic}
-
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## Overview
-{results.get('summary', 'No summary available')[:1000]}
-
-## Sources ({len(results.get('sources', []))})
-"""
-                
-                for i, source in enumerate(results.get("sources", []), 1):
-                    report_content += f"\n### {i}. {source['title']}\n"
-                    report_content += f"**URL:** {source.get('url', 'N/A')}\n\n"
-                    report_content += f"{source.get('snippet', 'No content')}\n\n"
-                
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.download_button(
-                        label="📥 Markdown",
-                        data=report_content,
-                        file_name=f"{topic.replace(' ', '_')}_report.md",
-                        mime="text/markdown",
-                        use_container_width=True
-                    )
-                with col2:
-                    st.download_button(
-                        label="📥 Text",
-                        data=report_content.replace("**", "").replace("###", ""),
-                        file_name=f"{topic.replace(' ', '_')}_report.txt",
-                        mime="text/plain",
-                        use_container_width=True
-                    )
-                with col3:
-                    st.download_button(
-                        label="📊 JSON",
-                        data=json.dumps(results, indent=2),
-                        file_name=f"{topic.replace(' ', '_')}_report.json",
-                        mime="application/json",
-                        use_container_width=True
-                    )
-                with col4:
-                    pdf_data = generate_pdf_report(topic, results)
-                    if pdf_data:
-                        st.download_button(
-                            label="📄 PDF",
-                            data=pdf_data,
-                            file_name=f"{topic.replace(' ', '_')}_report.pdf",
-                            mime="application/pdf",
-                            use_container_width=True
-                        )
-                
-                # Show statistics
-                st.markdown("---")
-                st.subheader("📈 Report Statistics")
-                col1, col2, col3 = st.columns(3)
-                col1.metric("📊 Total Sources", len(results.get("sources", [])))
-                col2.metric("📝 Total Characters", len(results.get("summary", "")))
-                col3.metric("⏱️ Generation Time", f"{time_limit}s")
+            _set_research_results(dr.get("data"))
+elif st.session_state.research_results:
+    st.markdown("---")
+
+# Render from session state so results survive reruns; each tab is a fragment,
+# so widgets inside a tab rerun only that tab
+results = st.session_state.research_results
+if results:
+    research_topic = results.get("query", topic)
+    
+    # Create tabs for different views
+    tab1, tab2, tab3, tab4 = st.tabs(["📚 Sources", "📊 Analysis", "💡 Summary", "⚙️ Export"])
+    
+    with tab1:
+        _sources_tab(results)
+    with tab2:
+        _analysis_tab(results)
+    with tab3:
+        _summary_tab(results, research_topic)
+    with tab4:
+        _export_tab(results, research_topic, time_limit)
 
 # Footer
 st.markdown("---")
-st.markdown("""
-<div style='text-align: center'>
-    <p><small>📚 Wikipedia Research Agent v2.0</small></p>
-    <p><small>Made with ❤️ for Research Excellence by <strong>Manideep Reddy Eevuri</strong></small></p>
-    <p style='margin-top: 20px;'>
-        <a href='https://github.com/Maniredii' target='_blank' style='text-decoration: none; margin: 0 10px;'>
-            <img src='https://img.shields.io/badge/GitHub-100000?style=for-the-badge&logo=github&logoColor=white' alt='GitHub'>
-        </a>
-        <a href='https://www.linkedin.com/in/manideep-reddy-eevuri-661659268/' target='_blank' style='text-decoration: none; margin: 0 10px;'>
-            <img src='https://img.shields.io/badge/LinkedIn-0077B5?style=for-the-badge&logo=linkedin&logoColor=white' alt='LinkedIn'>
-        </a>
-        <a href='https://buymeacoffee.com/manideep' target='_blank' style='text-decoration: none; margin: 0 10px;'>
-            <img src='https://img.shields.io/badge/Buy_Me_A_Coffee-FFDD00?style=for-the-badge&logo=buy-me-a-coffee&logoColor=black' alt='Buy Me A Coffee'>
-        </a>
-    </p>
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
\ No newline at end of file